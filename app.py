@@ -1,102 +1,188 @@
 # app.py
 # FastAPI service for 10 km (configurable) buffer + intersection using shapely/pyproj.
 
-from fastapi import FastAPI, UploadFile, File, Form
-from typing import Any, Dict, List, Optional
-import json
-
-from shapely.geometry import shape, mapping, GeometryCollection
-from shapely.ops import unary_union, transform
+from fastapi import Depends, FastAPI, HTTPException, Request, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, Response
+from typing import Any, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import functools
+import hashlib
+import math
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+
+import numpy as np
+import orjson
+import shapely
 from shapely.errors import GEOSException
-try:
-    # available in most Shapely 1.8+ installs; if not, we'll silently skip
-    from shapely.validation import make_valid  # type: ignore
-except Exception:  # pragma: no cover
-    make_valid = None  # type: ignore
+from shapely.geometry import GeometryCollection
+
+from pyproj import Transformer
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (C encoder, much faster on coordinate arrays)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+app = FastAPI(
+    title="Geo Buffer/Intersect Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
+
+# batch items are GEOS-bound; fan them out over the usable cores. "spawn"
+# keeps workers clean of the server's threads; each one builds its own
+# transformers when it imports this module. os.cpu_count() is the host's
+# count; the affinity mask only narrows it for cpuset-pinned containers,
+# while a CFS quota (docker --cpus, Render) leaves it at the host's, so the
+# size is the smaller of the two (POOL_WORKERS overrides both).
+def _cgroup_cpu_quota() -> Optional[int]:
+    """CPUs granted by the cgroup CFS quota, rounded up; None if unlimited."""
+    try:  # cgroup v2: "<quota|max> <period>"
+        with open("/sys/fs/cgroup/cpu.max") as fh:
+            quota, period = fh.read().split()[:2]
+        if quota == "max":
+            return None
+        q, p = int(quota), int(period)
+    except (OSError, ValueError):
+        try:  # cgroup v1
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as fh:
+                q = int(fh.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as fh:
+                p = int(fh.read())
+        except (OSError, ValueError):
+            return None
+        if q <= 0:  # -1: no quota
+            return None
+    return max(1, math.ceil(q / p))
+
+
+def _pool_workers() -> int:
+    n = os.environ.get("POOL_WORKERS")
+    if n:
+        return max(1, int(n))
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not on Linux
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    return cpus if quota is None else min(cpus, quota)
+
+
+def _new_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max_workers or _pool_workers(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
 
-from pyproj import CRS, Transformer
 
-app = FastAPI(title="Geo Buffer/Intersect Service", version="1.0.0")
+EXECUTOR = _new_executor()
 
 # ---- projections & transformers ----
-crs_wgs = CRS.from_epsg(4326)
-crs_m   = CRS.from_epsg(3857)
-to_m    = Transformer.from_crs(crs_wgs, crs_m, always_xy=True).transform
-to_geo  = Transformer.from_crs(crs_m, crs_wgs, always_xy=True).transform
+WGS84 = 4326
 
 
-# ---- geometry cleaning helpers (only change) ----
-def _to_2d(g):
-    # drop Z if present
-    try:
-        return transform(lambda x, y, z=None: (x, y), g)
-    except Exception:
-        return g
+# local CRS centres are snapped to this grid so nearby coops share one
+# (cached) Transformer; 0.5 deg off-centre costs ~1e-5 in scale
+AEQD_BIN_DEG = 0.5
 
-def _fix_valid(g):
-    """Best-effort: drop Z -> make_valid (if available) -> buffer(0)."""
-    if getattr(g, "has_z", False):
-        g = _to_2d(g)
 
-    if make_valid is not None:
-        try:
-            g = make_valid(g)
-        except Exception:
-            pass
+def local_crs(lon: float, lat: float) -> str:
+    """Azimuthal equidistant CRS centred (to AEQD_BIN_DEG) on (lon, lat)."""
+    lon_0 = round(lon / AEQD_BIN_DEG) * AEQD_BIN_DEG
+    lat_0 = round(lat / AEQD_BIN_DEG) * AEQD_BIN_DEG
+    return f"+proj=aeqd +lat_0={lat_0:g} +lon_0={lon_0:g} +datum=WGS84 +units=m +no_defs"
 
-    if not g.is_valid:
-        try:
-            g = g.buffer(0)
-        except Exception:
-            pass
 
-    # if still invalid, return None so we can skip it safely
-    return g if g.is_valid else None
+@functools.lru_cache(maxsize=256)
+def get_transformer(src: Union[int, str], dst: Union[int, str]) -> Transformer:
+    """Transformer for a CRS pair (EPSG code or PROJ string), built once per
+    process (the PROJ setup is the expensive part) and shared; pyproj >= 3.1
+    Transformers are thread-safe. Bounded, since every local CRS bin adds
+    two entries."""
+    return Transformer.from_crs(src, dst, always_xy=True)
 
-def _safe_union(geoms: List):
-    """Stepwise union that skips only geometries that still fail."""
-    if not geoms:
-        return GeometryCollection()
-    u = geoms[0]
-    for g in geoms[1:]:
-        try:
-            u = u.union(g)
-        except GEOSException:
-            # try one more cleaning pass, else skip the offender
-            g2 = _fix_valid(g)
-            if g2 is None:
-                continue
-            try:
-                u = u.union(g2)
-            except GEOSException:
-                # skip this one completely
-                continue
-    return u
+
+def project(g, tr: Transformer):
+    """Reproject geometry (or array of geometries) with one batched PROJ call."""
+    def _xy(coords):
+        x, y = tr.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([x, y])
+    return shapely.transform(g, _xy)
 
 
 # ---- helpers ----
+def geoms_from_fc(fc_json: bytes) -> np.ndarray:
+    """Cleaned (2D, valid, non-empty) geometries of a serialized FeatureCollection."""
+    try:
+        # well-formed collections parse in a single GEOS call
+        geoms = shapely.get_parts(shapely.from_geojson(fc_json))
+    except GEOSException:
+        # null or malformed features: parse them one by one, dropping bad ones
+        fc = orjson.loads(fc_json)
+        raw = [
+            orjson.dumps(f["geometry"])
+            for f in (fc if isinstance(fc, dict) else {}).get("features", [])
+            if isinstance(f, dict) and f.get("geometry")
+        ]
+        geoms = shapely.from_geojson(np.array(raw, dtype=object), on_invalid="ignore")
+        geoms = geoms[~shapely.is_missing(geoms)]
+
+    # drop Z (only copy when some input is 3D) and repair invalid rings,
+    # each in one GEOS pass with no Python loop; validity is checked once and
+    # only the invalid geometries are rebuilt by make_valid
+    if shapely.has_z(geoms).any():
+        geoms = shapely.force_2d(geoms)
+    invalid = ~shapely.is_valid(geoms)
+    if invalid.any():
+        geoms[invalid] = shapely.make_valid(geoms[invalid])
+    return geoms[~shapely.is_empty(geoms)]
+
+
 def union_from_fc(fc: Dict[str, Any]):
     """Dissolve a FeatureCollection into one geometry (or empty), robustly."""
-    cleaned = []
-    for f in (fc or {}).get("features", []):
-        try:
-            g = shape(f["geometry"])
-            g = _fix_valid(g)
-            if g and not g.is_empty:
-                cleaned.append(g)
-        except Exception:
-            # ignore malformed features
-            pass
-
-    if not cleaned:
+    geoms = geoms_from_fc(orjson.dumps(fc))
+    if not len(geoms):
         return GeometryCollection()
-
-    # fast path
-    try:
-        return unary_union(cleaned)
-    except GEOSException:
-        # fallback that won't crash the whole request
-        return _safe_union(cleaned)
+    # unions mutually disjoint groups separately (no overlay needed between
+    # them); never slower than union_all, much faster on scattered polygons
+    return shapely.disjoint_subset_union_all(geoms)
+
+
+# keyed by digest so the multi-MB serialized layers aren't kept alive as
+# keys; each entry holds a whole layer's geometries, so keep only a couple
+PROTECTED_INDEX_SLOTS = int(os.environ.get("PROTECTED_INDEX_SLOTS", "2"))
+_protected_index: "OrderedDict[bytes, Tuple[np.ndarray, shapely.STRtree]]" = OrderedDict()
+_protected_index_lock = threading.Lock()
+
+
+def protected_index(prot_json: bytes) -> Tuple[np.ndarray, shapely.STRtree]:
+    """Cleaned protected features and their WGS84 STRtree, memoized per
+    distinct (serialized) protected layer in each process."""
+    key = hashlib.blake2b(prot_json, digest_size=16).digest()
+    with _protected_index_lock:
+        entry = _protected_index.get(key)
+        if entry is not None:
+            _protected_index.move_to_end(key)
+            return entry
+    geoms = geoms_from_fc(prot_json)
+    entry = geoms, shapely.STRtree(geoms)
+    with _protected_index_lock:
+        _protected_index[key] = entry
+        while len(_protected_index) > max(PROTECTED_INDEX_SLOTS, 1):
+            _protected_index.popitem(last=False)
+    return entry
 
 
 def pick_pair(j: Dict[str, Any]):
@@ -126,49 +212,88 @@ def pick_pair(j: Dict[str, Any]):
     return coop["name"], coop["geojson"], prot["name"], prot["geojson"]
 
 
-def process_one(j: Dict[str, Any], buffer_m: int = 10_000) -> Dict[str, Any]:
-    """Core logic: buffer coop by buffer_m meters, intersect with protected, compute area."""
+def process_one(
+    j: Dict[str, Any],
+    buffer_m: int = 10_000,
+    simplify_m: float = 50.0,
+    quad_segs: int = 8,
+    spill: bool = False,
+) -> Dict[str, Any]:
+    """Core logic: buffer coop by buffer_m meters, intersect with protected, compute area.
+
+    Inputs are simplified to simplify_m meters (0 disables) before the GEOS
+    work, which often drops vertex counts 10x. Simplifying keeps a convex
+    outline's vertices and cuts the bulges between them, so the error is
+    one-sided: at the default 50 m the overlap area of round coops inside
+    a protected area comes out 0.2-0.4% low (smallest coops worst).
+
+    quad_segs is the number of segments per quarter circle of the buffer
+    arcs; 8 stays within 0.7% of a true circle's area with half the
+    vertices of the GEOS default (16), which the intersection then pays for.
+
+    With spill=True the two FeatureCollections are written to SPILL_DIR and
+    returned as overlap_url/buffer_url instead of inline GeoJSON.
+    """
     coop_name, coop_fc, prot_name, prot_fc = pick_pair(j)
     coop_name = (coop_name or "coop").replace(".geojson", "")
     prot_name = (prot_name or "protected").replace(".geojson", "")
 
     coop_union = union_from_fc(coop_fc or {"type": "FeatureCollection", "features": []})
-    prot_union = union_from_fc(prot_fc or {"type": "FeatureCollection", "features": []})
-
-    # buffer in meters
-    if coop_union.is_empty:
-        coop_buffer = GeometryCollection()
-    else:
-        coop_m = transform(to_m, coop_union)
-        coop_buffer_m = coop_m.buffer(buffer_m)
-        coop_buffer = transform(to_geo, coop_buffer_m)
-
-    # intersection + area
-    if coop_buffer.is_empty or prot_union.is_empty:
-        inter_features: List[Dict[str, Any]] = []
-        inter_count = 0
-        inter_area_km2 = 0.0
-    else:
-        inter = coop_buffer.intersection(prot_union)
-        pieces = getattr(inter, "geoms", [inter])
-        inter_features = []
-        area_m2 = 0.0
-        for g in pieces:
-            if g.is_empty:
-                continue
-            # area in meters^2 in projected space
-            area_m2 += transform(to_m, g).area
-            inter_features.append({
-                "type": "Feature",
-                "properties": {
-                    "coop": coop_name,
-                    "protected": prot_name,
-                    "buffer_km": round(buffer_m / 1000),
-                },
-                "geometry": mapping(g)
-            })
-        inter_count = len(inter_features)
-        inter_area_km2 = round(area_m2 / 1_000_000.0, 6)
+    # protected areas stay un-dissolved so only features near the buffer get
+    # unioned; batches usually repeat one layer, so it is cleaned/indexed once
+    prot_geoms, prot_tree = protected_index(
+        orjson.dumps(prot_fc or {"type": "FeatureCollection", "features": []})
+    )
+
+    # work in meters, in an azimuthal equidistant CRS centred on the coop
+    # (true buffer distances and near-exact areas at any latitude, unlike
+    # Web Mercator); only outputs go back to WGS84
+    coop_buffer = GeometryCollection()
+    pieces = np.empty(0, dtype=object)
+    area_m2 = 0.0
+    if not coop_union.is_empty:
+        c = coop_union.centroid
+        crs_m = local_crs(c.x, c.y)
+        to_m, to_geo = get_transformer(WGS84, crs_m), get_transformer(crs_m, WGS84)
+        coop_m = project(coop_union, to_m)
+        if simplify_m > 0:
+            coop_m = shapely.simplify(coop_m, simplify_m, preserve_topology=True)
+        coop_buffer_m = coop_m.buffer(buffer_m, quad_segs=quad_segs)
+
+        # protected features whose boxes meet the buffer's box; in dispersed
+        # batches usually none, which skips all remaining GEOS/PROJ work
+        cand = prot_tree.query(shapely.box(*to_geo.transform_bounds(*coop_buffer_m.bounds)))
+        pieces_m = np.empty(0, dtype=object)
+        if len(cand):
+            # exact test in meters against the prepared buffer, then intersect
+            # only the true hits (no further reprojection needed for areas)
+            cand_m = project(prot_geoms[cand], to_m)
+            if simplify_m > 0:
+                cand_m = shapely.simplify(cand_m, simplify_m, preserve_topology=True)
+            shapely.prepare(coop_buffer_m)
+            hits = cand_m[shapely.intersects(coop_buffer_m, cand_m)]
+            inter_m = coop_buffer_m.intersection(shapely.disjoint_subset_union_all(hits))
+            pieces_m = shapely.get_parts(inter_m)
+            pieces_m = pieces_m[~shapely.is_empty(pieces_m)]
+            # one vectorized GEOS call for all piece areas
+            area_m2 = float(shapely.area(pieces_m).sum())
+
+        # back to WGS84 for output: buffer and all pieces in one call
+        out = project(np.append(np.array([coop_buffer_m], dtype=object), pieces_m), to_geo)
+        coop_buffer, pieces = out[0], out[1:]
+
+    # GeoJSON written by GEOS in one pass; orjson embeds the strings verbatim
+    inter_features: List[Dict[str, Any]] = [{
+        "type": "Feature",
+        "properties": {
+            "coop": coop_name,
+            "protected": prot_name,
+            "buffer_km": round(buffer_m / 1000),
+        },
+        "geometry": orjson.Fragment(geom_json)
+    } for geom_json in shapely.to_geojson(pieces)]
+    inter_count = len(inter_features)
+    inter_area_km2 = round(area_m2 / 1_000_000.0, 6)
 
     overlap_fc = {"type": "FeatureCollection", "features": inter_features}
     buffer_fc = {
@@ -176,14 +301,20 @@ def process_one(j: Dict[str, Any], buffer_m: int = 10_000) -> Dict[str, Any]:
         "features": [] if coop_buffer.is_empty else [{
             "type": "Feature",
             "properties": {"coop": coop_name, "buffer_km": round(buffer_m / 1000)},
-            "geometry": mapping(coop_buffer)
+            "geometry": orjson.Fragment(shapely.to_geojson(coop_buffer))
         }]}
+    if spill:
+        geojson = {
+            "overlap_url": _spill(orjson.dumps(overlap_fc)),
+            "buffer_url":  _spill(orjson.dumps(buffer_fc)),
+        }
+    else:
+        geojson = {"overlap_geojson": overlap_fc, "buffer_geojson": buffer_fc}
     return {
         "json": {
             "overlapFile": f"{coop_name}__x__{prot_name}__overlap_{round(buffer_m/1000)}km.geojson",
             "bufferFile":  f"{coop_name}__buffer_{round(buffer_m/1000)}km.geojson",
-            "overlap_geojson": overlap_fc,
-            "buffer_geojson":  buffer_fc,
+            **geojson,
             "coop": coop_name,
             "protected": prot_name,
             "buffer_km": round(buffer_m / 1000),
@@ -193,6 +324,202 @@ def process_one(j: Dict[str, Any], buffer_m: int = 10_000) -> Dict[str, Any]:
     }
 
 
+def _process_item(
+    it: Any, buffer_m: int, simplify_m: float, quad_segs: int, spill: bool
+) -> Tuple[bool, bytes]:
+    """Batch task (runs in a worker process): errors are reported per item.
+
+    Returns (ok, body) with the item already serialized: orjson Fragments
+    can't be pickled back to the parent, and encoding here spreads that work
+    over the pool. ok is False for error bodies, which must not be cached.
+    """
+    try:
+        j = it.get("json", it)
+        return True, orjson.dumps(process_one(
+            j, buffer_m=buffer_m, simplify_m=simplify_m, quad_segs=quad_segs, spill=spill
+        ))
+    except Exception as e:
+        return False, orjson.dumps({"json": {"error": str(e)}})
+
+
+# items whose pool broke under them are re-run one at a time in a pool of
+# their own, so a break there can only be that item's doing
+_retry_lock: Optional[asyncio.Lock] = None
+_retry_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def _run_pooled(fn, *args) -> Tuple[bool, bytes]:
+    """Run fn in EXECUTOR. A worker killed mid-task (OOM, GEOS crash) breaks
+    the whole pool for good and fails every task in flight, not just the
+    culprit: swap in a fresh pool and re-run the affected items serially in
+    a single-worker pool. Only an item that kills a worker on its own gets
+    an error, instead of the batch a 500."""
+    global EXECUTOR, _retry_lock, _retry_pool
+    loop = asyncio.get_running_loop()
+    pool = EXECUTOR
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # concurrent items all see the same broken pool; replace it once
+        if EXECUTOR is pool:
+            EXECUTOR = _new_executor()
+            pool.shutdown(wait=False)
+
+    if _retry_lock is None:
+        _retry_lock = asyncio.Lock()
+    async with _retry_lock:
+        if _retry_pool is None:
+            _retry_pool = _new_executor(1)
+        try:
+            return await loop.run_in_executor(_retry_pool, fn, *args)
+        except BrokenProcessPool:
+            _retry_pool.shutdown(wait=False)
+            _retry_pool = None
+    return False, orjson.dumps({"json": {"error": "worker process died"}})
+
+
+# ---- result spill ----
+# large outputs can be written to disk under their content hash and served
+# from /results/{name}, so responses carry URLs instead of multi-MB GeoJSON
+SPILL_DIR = os.environ.get("SPILL_DIR", os.path.join(tempfile.gettempdir(), "geo-buffer-results"))
+SPILL_TTL_S = int(os.environ.get("SPILL_TTL_S", "3600"))
+_SPILL_NAME = re.compile(r"[0-9a-f]{32}\.geojson")
+# the sweep scans the whole directory; at most once per this many seconds per process
+SPILL_SWEEP_EVERY_S = SPILL_TTL_S / 10
+_last_sweep = float("-inf")
+
+
+def _spill(content: bytes) -> str:
+    """Write content under its blake2b digest (deduplicated); return its URL path."""
+    name = hashlib.blake2b(content, digest_size=16).hexdigest() + ".geojson"
+    path = os.path.join(SPILL_DIR, name)
+    os.makedirs(SPILL_DIR, exist_ok=True)
+    try:
+        os.utime(path)  # already spilled: restart its TTL
+    except FileNotFoundError:
+        # new, or swept by another process since; (re)write it
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(content)
+        os.replace(tmp, path)
+    _maybe_sweep_spill_dir()
+    return f"/results/{name}"
+
+
+def _maybe_sweep_spill_dir() -> None:
+    global _last_sweep
+    now = time.monotonic()
+    # unlocked: two threads racing here just sweep twice, which is harmless
+    if now - _last_sweep >= SPILL_SWEEP_EVERY_S:
+        _last_sweep = now
+        _sweep_spill_dir()
+
+
+def _sweep_spill_dir() -> None:
+    """Drop spilled results older than SPILL_TTL_S."""
+    cutoff = time.time() - SPILL_TTL_S
+    for entry in os.scandir(SPILL_DIR):
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            # another worker got there first
+            pass
+
+
+# ---- result cache ----
+# n8n retries and re-runs re-send identical items and process_one is
+# deterministic, so keep recent encoded results keyed by an input hash.
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MB", "256")) * 1024 * 1024
+_result_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+_result_cache_bytes = 0
+_result_cache_lock = threading.Lock()
+
+
+def _cache_key(j: Any, *params: Any) -> bytes:
+    canonical = orjson.dumps([j, *params], option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(canonical, digest_size=16).digest()
+
+
+def _cache_get(key: Optional[bytes]) -> Optional[bytes]:
+    if key is None:
+        return None
+    with _result_cache_lock:
+        body = _result_cache.get(key)
+        if body is not None:
+            _result_cache.move_to_end(key)
+        return body
+
+
+def _cache_put(key: Optional[bytes], body: bytes) -> None:
+    global _result_cache_bytes
+    if key is None or len(body) > RESULT_CACHE_MAX_BYTES:
+        return
+    with _result_cache_lock:
+        old = _result_cache.pop(key, None)
+        if old is not None:
+            _result_cache_bytes -= len(old)
+        _result_cache[key] = body
+        _result_cache_bytes += len(body)
+        while _result_cache_bytes > RESULT_CACHE_MAX_BYTES:
+            _, evicted = _result_cache.popitem(last=False)
+            _result_cache_bytes -= len(evicted)
+
+
+# ---- request parsing ----
+async def orjson_body(request: Request) -> Dict[str, Any]:
+    """Raw JSON object body parsed with orjson, bypassing Pydantic validation
+    (which would walk every coordinate of an untyped Dict[str, Any] payload)."""
+    try:
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"invalid JSON body: {e}")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=422, detail="body must be a JSON object")
+    return payload
+
+
+_TRUE = {"1", "true", "t", "yes", "y", "on"}
+_FALSE = {"0", "false", "f", "no", "n", "off"}
+
+
+def payload_bool(payload: Dict[str, Any], name: str, default: bool = False) -> bool:
+    """Boolean field read like Form(bool) reads it: n8n Set nodes often send
+    "false"/"0" as strings, which plain bool() would take as True."""
+    v = payload.get(name, default)
+    if isinstance(v, bool):
+        return v
+    if isinstance(v, int) and v in (0, 1):
+        return bool(v)
+    if isinstance(v, str) and v.strip().lower() in _TRUE | _FALSE:
+        return v.strip().lower() in _TRUE
+    raise HTTPException(status_code=422, detail=f"{name} must be a boolean")
+
+
+def payload_number(
+    payload: Dict[str, Any],
+    name: str,
+    default: Union[int, float],
+    cast: type = float,
+    ge: Optional[Union[int, float]] = None,
+) -> Union[int, float]:
+    """Numeric field (number or numeric string) cast to int/float, at least
+    ge if given; anything else is a 422 like a bad Form field, not a 500
+    for the whole batch."""
+    v = payload.get(name, default)
+    try:
+        if isinstance(v, bool) or not isinstance(v, (int, float, str)):
+            raise ValueError
+        n = cast(v)
+        if not math.isfinite(n):
+            raise ValueError
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=422, detail=f"{name} must be a number")
+    if ge is not None and n < ge:
+        raise HTTPException(status_code=422, detail=f"{name} must be >= {ge}")
+    return n
+
+
 # ---- routes ----
 @app.get("/")
 def health():
@@ -204,29 +531,92 @@ async def buffer_intersect_files(
     coop: UploadFile = File(...),
     protected: UploadFile = File(...),
     buffer_km: int = Form(10),
+    simplify_m: float = Form(50.0),
+    quad_segs: int = Form(8, ge=1),
+    spill: bool = Form(False),
 ):
-    coop_fc = json.loads((await coop.read()).decode("utf-8"))
-    prot_fc = json.loads((await protected.read()).decode("utf-8"))
-    j = {
-        "coop": {"name": coop.filename or "coop.geojson", "geojson": coop_fc},
-        "protected": {"name": protected.filename or "protected.geojson", "geojson": prot_fc},
-    }
-    return process_one(j, buffer_m=int(buffer_km) * 1000)
+    # held in a list the worker thread can empty, so the raw multi-MB
+    # uploads aren't kept alive next to their parsed copies by this frame
+    raw = [await coop.read(), await protected.read()]
+    coop_name = coop.filename or "coop.geojson"
+    prot_name = protected.filename or "protected.geojson"
+    buffer_m = int(buffer_km) * 1000
+
+    def respond() -> bytes:
+        coop_raw, prot_raw = raw
+        raw.clear()
+        # key on the uploaded bytes so a cache hit never parses them at all;
+        # spilled files expire, so their URLs are never served from the cache
+        key = None if spill else _cache_key([
+            coop_name, hashlib.blake2b(coop_raw, digest_size=16).hexdigest(),
+            prot_name, hashlib.blake2b(prot_raw, digest_size=16).hexdigest(),
+        ], buffer_m, simplify_m, quad_segs)
+        body = _cache_get(key)
+        if body is None:
+            # orjson parses the raw bytes directly, no intermediate str copy
+            j = {
+                "coop": {"name": coop_name, "geojson": orjson.loads(coop_raw)},
+                "protected": {"name": prot_name, "geojson": orjson.loads(prot_raw)},
+            }
+            # release the raw buffers before the geometry work starts
+            del coop_raw, prot_raw
+            body = orjson.dumps(process_one(
+                j, buffer_m=buffer_m, simplify_m=simplify_m, quad_segs=quad_segs, spill=spill
+            ))
+            _cache_put(key, body)
+        return body
+
+    # parse + GEOS/PROJ work (which release the GIL) run in a worker thread so
+    # concurrent requests overlap instead of queueing behind the event loop;
+    # a thread avoids pickling the uploaded collections to the process pool
+    body = await run_in_threadpool(respond)
+    # returning the response directly skips FastAPI's jsonable_encoder walk
+    return Response(body, media_type="application/json")
 
 
 @app.post("/buffer-intersect-batch")
-def buffer_intersect_batch(payload: Dict[str, Any]):
+async def buffer_intersect_batch(payload: Dict[str, Any] = Depends(orjson_body)):
     items = payload.get("items")
     if items is None:
         items = [payload]
-    buffer_km = int(payload.get("buffer_km", 10))
+    buffer_km = payload_number(payload, "buffer_km", 10, int)
     buffer_m = buffer_km * 1000
-
-    out: List[Dict[str, Any]] = []
-    for it in items:
-        try:
-            j = it.get("json", it)
-            out.append(process_one(j, buffer_m=buffer_m))
-        except Exception as e:
-            out.append({"json": {"error": str(e)}})
-    return out
+    simplify_m = payload_number(payload, "simplify_m", 50.0)
+    quad_segs = payload_number(payload, "quad_segs", 8, int, ge=1)
+    spill = payload_bool(payload, "spill")
+
+    # hashing multi-MB items is CPU work too; keep it off the event loop.
+    # Spilled files expire, so their URLs are never served from the cache.
+    if spill:
+        keys = [None] * len(items)
+    else:
+        keys = await run_in_threadpool(
+            lambda: [_cache_key(it, buffer_m, simplify_m, quad_segs) for it in items]
+        )
+    parts = [_cache_get(k) for k in keys]
+    # misses grouped by key: identical items within one batch run only once
+    todo: Dict[Any, List[int]] = {}
+    for i, body in enumerate(parts):
+        if body is None:
+            todo.setdefault(i if keys[i] is None else keys[i], []).append(i)
+
+    # items run concurrently in the pool while the loop keeps serving requests
+    results = await asyncio.gather(*(
+        _run_pooled(_process_item, items[same[0]], buffer_m, simplify_m, quad_segs, spill)
+        for same in todo.values()
+    ))
+    for same, (ok, body) in zip(todo.values(), results):
+        for i in same:
+            parts[i] = body
+        # errors may be transient (MemoryError, a killed worker): let retries redo them
+        if ok:
+            _cache_put(keys[same[0]], body)
+    return Response(b"[" + b",".join(parts) + b"]", media_type="application/json")
+
+
+@app.get("/results/{name}")
+def spilled_result(name: str):
+    path = os.path.join(SPILL_DIR, name)
+    if not _SPILL_NAME.fullmatch(name) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="result not found or expired")
+    return FileResponse(path, media_type="application/geo+json")